@@ -149,6 +149,8 @@ class VectorDB:
     def __init__(self):
         self.initialized = False
         self.index = None
+        # Bumped on every write so search caches keyed on it drop stale results
+        self.version = 0
         self.logger = logging.getLogger("gemini_agent") 
         try:
             self.index = UpstashVectorIndex.from_env()
@@ -174,12 +176,37 @@ class VectorDB:
                 "data": text,
                 "metadata": metadata or {}
             }])
+            self.version += 1
             self.logger.debug(f"Added VDB entry: {text[:50]}...")
             return True
         except Exception as e:
             self.logger.error(f"VDB add error: {e}", exc_info=True)
             return False
 
+    def add_many(self, texts, metadatas=None):
+        if not self.is_ready():
+            self.logger.warning("VDB add_many skipped: Not initialized.")
+            return False
+        import uuid
+        metadatas = metadatas or [None] * len(texts)
+        vectors = [
+            {"id": str(uuid.uuid4()), "data": text, "metadata": metadata or {}}
+            for text, metadata in zip(texts, metadatas)
+            if text and isinstance(text, str)
+        ]
+        if not vectors:
+            self.logger.warning("VDB add_many skipped: No valid texts.")
+            return False
+        try:
+            # One upsert for the whole batch; Upstash embeds every entry server-side
+            self.index.upsert(vectors)
+            self.version += 1
+            self.logger.debug(f"Added {len(vectors)} VDB entries.")
+            return True
+        except Exception as e:
+            self.logger.error(f"VDB add_many error: {e}", exc_info=True)
+            return False
+
     def search(self, query, top_k=3):
         if not self.is_ready():
             self.logger.error("VDB search fail: Not initialized.")
@@ -193,6 +220,29 @@ class VectorDB:
             self.logger.error(f"VDB search error: {e}", exc_info=True)
             raise VectorDBError(f"VDB search failed: {e}")
 
+    def search_batch(self, queries, top_k=3):
+        if not self.is_ready():
+            self.logger.error("VDB search_batch fail: Not initialized.")
+            raise VectorDBError("VDB not initialized")
+        try:
+            if hasattr(self.index, "query_many"):
+                # One round trip for the whole batch; Upstash embeds every query server-side
+                batches = self.index.query_many(queries=[
+                    {"data": query, "top_k": top_k, "include_metadata": True}
+                    for query in queries
+                ])
+            else:
+                batches = [self.index.query(data=query, top_k=top_k, include_metadata=True) for query in queries]
+            formatted_batches = [
+                [{"text": getattr(match, "data", ""), "similarity": getattr(match, "score", 0.0), "metadata": getattr(match, "metadata", {})} for match in results]
+                for results in batches
+            ]
+            self.logger.info(f"VDB search_batch of {len(queries)} queries done.")
+            return formatted_batches
+        except Exception as e:
+            self.logger.error(f"VDB search_batch error: {e}", exc_info=True)
+            raise VectorDBError(f"VDB search_batch failed: {e}")
+
     def is_ready(self):
         return self.initialized and self.index is not None
 
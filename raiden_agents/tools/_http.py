@@ -0,0 +1,27 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled session for every tool that talks HTTP. Auth differs per API, so callers
+# pass their own headers per request rather than setting them on the session.
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Back off and retry transient failures instead of failing the whole tool call
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=frozenset(["GET", "POST"])
+                )
+                session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=50))
+                _session = session
+    return _session
@@ -77,9 +77,10 @@ class AudioUnderstandingTool(Tool):
                           raise ToolExecutionError(f"Unsupported or undetermined audio MIME type for URL: {mime_type or 'None'}")
 
                 # Read content, checking size limit
-                audio_bytes = b""
-                for chunk in response.iter_content(chunk_size=8192):
-                    audio_bytes += chunk
+                # Accumulate in a bytearray (amortized O(N)); b64encode takes it as-is
+                audio_bytes = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    audio_bytes.extend(chunk)
                     if len(audio_bytes) > MAX_INLINE_SIZE_BYTES:
                         raise ToolExecutionError(f"Audio file from URL exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB).")
 
@@ -8,6 +8,20 @@ class APIKeyError(AgentException): pass
 class VectorDBError(AgentException): pass
 class GitHubToolError(ToolExecutionError): pass
 
+# Resolved on first use: the tools package is imported before __main__ creates vector_db
+_vector_db = None
+
+def get_vector_db():
+    """Return the application's vector DB, caching it once __main__ has created it"""
+    global _vector_db
+    if _vector_db is None:
+        try:
+            from __main__ import vector_db
+            _vector_db = vector_db
+        except ImportError:
+            pass
+    return _vector_db
+
 class Tool:
     def __init__(self, name, description, parameters=None, required=None):
         self.name = name
@@ -31,7 +45,8 @@ class Tool:
     def validate_args(self, args):
         if not isinstance(args, dict):
             raise ToolExecutionError("Arguments must be a dictionary.")
-        missing = [p for p in self.required if p not in args or args[p] is None]
+        # Only the required list is checked here; there is no JSON Schema to compile per call
+        missing = [p for p in self.required if args.get(p) is None]
         if missing:
             raise ToolExecutionError(f"Missing required parameters: {', '.join(missing)}")
         return True
@@ -1,8 +1,18 @@
-import stripe
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from .base_tool import Tool, ToolExecutionError
 
+# stripe pulls in its whole api_resources package on import; defer it until first use
+_stripe = None
+
+def _get_stripe():
+    """Import the stripe SDK on first use and cache the module."""
+    global _stripe
+    if _stripe is None:
+        import stripe as _stripe_module
+        _stripe = _stripe_module
+    return _stripe
+
 class StripePaymentTool(Tool):
     """Enhanced Stripe Tool with comprehensive payment and subscription features"""
     
@@ -105,13 +115,20 @@ class StripePaymentTool(Tool):
                 "required": ["operation"]
             }
         )
-        stripe.api_key = api_key
+        self.api_key = api_key
         self.webhook_secret = webhook_secret
 
+    @property
+    def _stripe(self):
+        """The lazily imported stripe module, cached by _get_stripe()"""
+        return _get_stripe()
+
     def execute(self, **kwargs) -> Union[str, Dict[str, Any]]:
         """Execute Stripe operations based on provided parameters"""
         self.validate_args(kwargs)
         operation = kwargs.pop("operation")
+        stripe = self._stripe
+        stripe.api_key = self.api_key
 
         try:
             # Payment Operations
@@ -241,13 +258,13 @@ class StripePaymentTool(Tool):
         if metadata:
             params["metadata"] = metadata
 
-        return stripe.PaymentIntent.create(**params)
+        return self._stripe.PaymentIntent.create(**params)
 
     def _confirm_payment(self, payment_intent_id: str, 
                         payment_method: Optional[str] = None, 
                         **kwargs) -> Dict[str, Any]:
         """Confirm a payment intent"""
-        return stripe.PaymentIntent.confirm(
+        return self._stripe.PaymentIntent.confirm(
             payment_intent_id,
             payment_method=payment_method
         )
@@ -256,7 +273,7 @@ class StripePaymentTool(Tool):
                        cancellation_reason: Optional[str] = None,
                        **kwargs) -> Dict[str, Any]:
         """Cancel a payment intent"""
-        return stripe.PaymentIntent.cancel(
+        return self._stripe.PaymentIntent.cancel(
             payment_intent_id,
             cancellation_reason=cancellation_reason
         )
@@ -268,7 +285,7 @@ class StripePaymentTool(Tool):
         params = {"payment_intent": payment_intent_id}
         if amount:
             params["amount"] = amount
-        return stripe.Refund.create(**params)
+        return self._stripe.Refund.create(**params)
 
     # Customer Methods
     def _create_customer(self, email: str, name: Optional[str] = None,
@@ -283,7 +300,7 @@ class StripePaymentTool(Tool):
             params["payment_method"] = payment_method
         if metadata:
             params["metadata"] = metadata
-        return stripe.Customer.create(**params)
+        return self._stripe.Customer.create(**params)
 
     def _update_customer(self, customer_id: str,
                         email: Optional[str] = None,
@@ -298,7 +315,7 @@ class StripePaymentTool(Tool):
             params["name"] = name
         if metadata:
             params["metadata"] = metadata
-        return stripe.Customer.modify(customer_id, **params)
+        return self._stripe.Customer.modify(customer_id, **params)
 
     # Subscription Methods
     def _create_subscription(self, customer_id: str, price_id: str,
@@ -314,12 +331,12 @@ class StripePaymentTool(Tool):
             params["trial_period_days"] = trial_period_days
         if metadata:
             params["metadata"] = metadata
-        return stripe.Subscription.create(**params)
+        return self._stripe.Subscription.create(**params)
 
     def _pause_subscription(self, subscription_id: str,
                           **kwargs) -> Dict[str, Any]:
         """Pause a subscription"""
-        return stripe.Subscription.modify(
+        return self._stripe.Subscription.modify(
             subscription_id,
             pause_collection={"behavior": "void"}
         )
@@ -334,7 +351,7 @@ class StripePaymentTool(Tool):
             params["description"] = description
         if metadata:
             params["metadata"] = metadata
-        return stripe.Product.create(**params)
+        return self._stripe.Product.create(**params)
 
     # Price Methods
     def _create_price(self, product_id: str, unit_amount: int,
@@ -351,7 +368,7 @@ class StripePaymentTool(Tool):
             params["recurring"] = recurring
         if metadata:
             params["metadata"] = metadata
-        return stripe.Price.create(**params)
+        return self._stripe.Price.create(**params)
 
     # Invoice Methods
     def _create_invoice(self, customer_id: str,
@@ -364,14 +381,14 @@ class StripePaymentTool(Tool):
             params["description"] = description
         if metadata:
             params["metadata"] = metadata
-        return stripe.Invoice.create(**params)
+        return self._stripe.Invoice.create(**params)
 
     # Webhook Methods
     def _verify_webhook(self, payload: str, sig_header: str,
                        **kwargs) -> bool:
         """Verify webhook signature"""
         try:
-            stripe.Webhook.construct_event(
+            self._stripe.Webhook.construct_event(
                 payload, sig_header, self.webhook_secret
             )
             return True
@@ -389,14 +406,14 @@ class StripePaymentTool(Tool):
         amount_float = amount / 100.0
         return f"{symbol}{amount_float:.2f}"
 
-    def _handle_error(self, error: stripe.error.StripeError) -> Dict[str, Any]:
+    def _handle_error(self, error: "stripe.error.StripeError") -> Dict[str, Any]:
         """Handle Stripe errors"""
         error_types = {
-            stripe.error.CardError: "Card Error",
-            stripe.error.InvalidRequestError: "Invalid Request",
-            stripe.error.AuthenticationError: "Authentication Error",
-            stripe.error.APIConnectionError: "API Connection Error",
-            stripe.error.StripeError: "Generic Stripe Error"
+            self._stripe.error.CardError: "Card Error",
+            self._stripe.error.InvalidRequestError: "Invalid Request",
+            self._stripe.error.AuthenticationError: "Authentication Error",
+            self._stripe.error.APIConnectionError: "API Connection Error",
+            self._stripe.error.StripeError: "Generic Stripe Error"
         }
         error_type = error_types.get(type(error), "Unknown Error")
         return {
@@ -1,14 +1,256 @@
+import atexit
+import fnmatch
 import logging
 import os
-import subprocess
-import json
+import re
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from .base_tool import Tool, ToolExecutionError
 
+# Try importing orjson for faster JSON encoding, fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("raiden_agent")
 
+# Per-file work is dominated by syscall latency, so keep several files in flight
+_IO_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# ASCII case tables let bytes.translate convert without decoding
+_UPPER_TABLE = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LOWER_TABLE = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+# File extension -> category directory used by the organize operation
+_EXT_CATEGORY = {
+    ext: category
+    for category, extensions in (
+        ("images", ("jpg", "jpeg", "png", "gif")),
+        ("audio", ("mp3", "wav", "flac")),
+        ("videos", ("mp4", "avi", "mov")),
+        ("documents", ("pdf", "doc", "docx", "txt"))
+    )
+    for ext in extensions
+}
+
+# Trailing "_YYYYmmdd_HHMMSS" timestamp on backup folder names
+_BACKUP_TS_RE = re.compile(r"_(\d{8}_\d{6})$")
+
+# Read-only opens skip the atime update (Linux) and are not inherited by child processes
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+_READ_FLAGS = os.O_RDONLY | _O_NOATIME | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+# Userspace copy fallback reuses one buffer per worker thread instead of allocating per file
+_COPY_BUFFER_SIZE = 1 << 20
+_copy_buffers = threading.local()
+
+# Above this many deletions, fan unlinks out to hide per-call filesystem latency (NFS/EFS)
+_PARALLEL_UNLINK_THRESHOLD = 256
+# Ceiling on concurrently running batch commands, whatever max_parallel asks for
+_MAX_PARALLEL_COMMANDS = 64
+# Event log records are flushed as written; fsync is batched to at most once per this many seconds
+_EVENTS_FSYNC_INTERVAL = 30
+
+def _safe_unlink(path):
+    """Remove a file, returning 1 on success and 0 on failure"""
+    try:
+        os.unlink(path)
+        return 1
+    except OSError:
+        return 0
+
+def _open_for_read(path, buffering=-1):
+    """Open a file for binary reading without updating its access time where supported"""
+    try:
+        fd = os.open(path, _READ_FLAGS)
+    except PermissionError:
+        if not _O_NOATIME:
+            raise
+        # O_NOATIME is only permitted for the file's owner
+        fd = os.open(path, _READ_FLAGS & ~_O_NOATIME)
+    return os.fdopen(fd, "rb", buffering=buffering)
+
+def _count_lines(path):
+    """Count lines by scanning raw bytes for newlines, without decoding"""
+    line_count = 0
+    last = b""
+    with _open_for_read(path, buffering=0) as f:
+        while True:
+            buf = f.read(1 << 20)
+            if not buf:
+                break
+            line_count += buf.count(b"\n")
+            last = buf
+    # A trailing line without a newline still counts, as in text-mode iteration
+    if last and not last.endswith(b"\n"):
+        line_count += 1
+    return line_count
+
+def _convert_case(file_path, conversion_type):
+    """Upper- or lower-case a text file in place, returning 1 on success and 0 on failure"""
+    upper = conversion_type == "text_to_uppercase"
+    try:
+        with _open_for_read(file_path) as f:
+            data = f.read()
+        if data.isascii():
+            data = data.translate(_UPPER_TABLE if upper else _LOWER_TABLE)
+        else:
+            text = data.decode("utf-8")
+            data = (text.upper() if upper else text.lower()).encode("utf-8")
+        file_path.write_bytes(data)
+        return 1
+    except Exception as e:
+        logger.error(f"Error processing file {file_path}: {e}")
+        return 0
+
+def _matching_files(source_path, file_pattern):
+    """List files in source_path whose names match a glob pattern"""
+    if "/" in file_pattern or "\\" in file_pattern or "**" in file_pattern:
+        # Recursive or multi-segment patterns still need pathlib's glob
+        return [path for path in source_path.glob(file_pattern) if path.is_file()]
+    
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    pattern = re.compile(fnmatch.translate(file_pattern), flags)
+    # Materialize the listing so callers can rename files while iterating
+    with os.scandir(source_path) as it:
+        return [
+            Path(entry.path) for entry in it
+            if pattern.match(entry.name) and entry.is_file()
+        ]
+
+def _copy_buffer():
+    """Return this thread's reusable copy buffer"""
+    buf = getattr(_copy_buffers, "buf", None)
+    if buf is None:
+        buf = _copy_buffers.buf = bytearray(_COPY_BUFFER_SIZE)
+    return buf
+
+def _copy_file_range(fsrc, fdst, size):
+    """Copy between file descriptors with copy_file_range (may reflink on CoW filesystems)"""
+    remaining = size
+    while remaining > 0:
+        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+        if copied == 0:
+            break
+        remaining -= copied
+
+def _sendfile(fsrc, fdst, size):
+    """Copy between file descriptors with sendfile"""
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+# Kernel-side copy strategies, tried in order
+_KERNEL_COPIES = [
+    copy for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+    if hasattr(os, name)
+]
+
+def _reflink_or_copy(src, dst):
+    """Copy a file inside the kernel where possible, falling back to a buffered userspace copy"""
+    with _open_for_read(src, buffering=0) as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        for kernel_copy in _KERNEL_COPIES:
+            try:
+                kernel_copy(fsrc, fdst, size)
+                break
+            except OSError:
+                # Unsupported here (e.g. cross-device); start over with the next strategy
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        else:
+            buf = _copy_buffer()
+            view = memoryview(buf)
+            while True:
+                n = fsrc.readinto(buf)
+                if not n:
+                    break
+                fdst.write(view[:n])
+    shutil.copymode(src, dst)
+    return dst
+
+def _copy_tree(src, dst, exclude=None):
+    """Copy the contents of src into dst, skipping the exclude path, and return the number of files copied"""
+    file_count = 0
+    
+    def copy_function(file_src, file_dst):
+        nonlocal file_count
+        file_count += 1
+        return _reflink_or_copy(file_src, file_dst)
+    
+    def ignore(directory, names):
+        # exclude is spelled the way copytree joins paths, so no per-directory resolve is needed
+        return [n for n in names if os.path.join(directory, n) == exclude]
+    
+    shutil.copytree(src, dst, symlinks=True, dirs_exist_ok=True, copy_function=copy_function,
+                    ignore=ignore if exclude else None)
+    return file_count
+
+def _walk_newer(root, cutoff, exclude=None):
+    """Yield (path, relative_path, mtime) for files under root modified after cutoff, skipping exclude"""
+    root = os.fspath(root)
+    # Every entry path starts with root plus a separator, so slice instead of os.path.relpath
+    prefix_len = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path != exclude:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    # DirEntry caches the stat result, so this is one syscall per entry
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_mtime > cutoff:
+                        yield entry.path, entry.path[prefix_len:], st.st_mtime
+
+async def _run_command(cmd, timeout, semaphore):
+    """Run a single shell command and return its result record"""
+    import asyncio
+    async with semaphore:
+        logger.info(f"Executing command: {cmd}")
+        proc = await asyncio.create_subprocess_shell(
+            cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        
+        stdout = stdout.decode(errors="replace")
+        stderr = stderr.decode(errors="replace")
+        status = "success" if proc.returncode == 0 else "failed"
+        return {
+            "command": cmd,
+            "status": status,
+            "return_code": proc.returncode,
+            "output": stdout[:1000],  # Limit output size
+            "error": stderr[:1000] if stderr else None
+        }
+
+async def _run_commands(commands, timeout, max_parallel):
+    """Run independent shell commands concurrently, capped at max_parallel"""
+    import asyncio
+    semaphore = asyncio.Semaphore(max_parallel)
+    return await asyncio.gather(
+        *[_run_command(cmd, timeout, semaphore) for cmd in commands],
+        return_exceptions=True
+    )
+
 class TaskAutomationTool(Tool):
     def __init__(self):
         super().__init__(
@@ -38,6 +280,10 @@ class TaskAutomationTool(Tool):
         # Create task history directory
         self.task_history_dir = Path("task_automation_history")
         os.makedirs(self.task_history_dir, exist_ok=True)
+        # Task events are appended to a single NDJSON log, flushed per record and fsync'd periodically and at exit
+        self._events_fp = open(self.task_history_dir / "events.ndjson", "ab", buffering=1 << 16)
+        self._events_synced_at = time.monotonic()
+        atexit.register(self._close_events_log)
     
     def execute(self, **kwargs):
         self.validate_args(kwargs)
@@ -72,7 +318,8 @@ class TaskAutomationTool(Tool):
                 raise ToolExecutionError(f"Unsupported task type: {task_type}")
             
             # Record task completion
-            self._record_task_event(task_id, "completed", result)
+            completed_at = datetime.now().isoformat()
+            self._record_task_event(task_id, "completed", result, completed_at)
             
             # Store in vector DB if available
             try:
@@ -86,7 +333,7 @@ class TaskAutomationTool(Tool):
                             "task_type": task_type,
                             "parameters": task_parameters,
                             "result": result,
-                            "time": datetime.now().isoformat()
+                            "time": completed_at
                         }
                     )
             except ImportError:
@@ -116,32 +363,31 @@ class TaskAutomationTool(Tool):
             else:
                 target_dir = source_dir
             
+            # Resolve category directories once
+            target_root = Path(target_dir)
+            category_dirs = {
+                category: target_root / category
+                for category in set(_EXT_CATEGORY.values()) | {"other"}
+            }
+            created_dirs = set()
+            
             # Find and organize files
             file_count = 0
-            for file_path in source_path.glob(file_pattern):
-                if file_path.is_file():
-                    # Determine category based on extension
-                    extension = file_path.suffix.lower()[1:]
-                    if extension in ["jpg", "jpeg", "png", "gif"]:
-                        category = "images"
-                    elif extension in ["mp3", "wav", "flac"]:
-                        category = "audio"
-                    elif extension in ["mp4", "avi", "mov"]:
-                        category = "videos"
-                    elif extension in ["pdf", "doc", "docx", "txt"]:
-                        category = "documents"
-                    else:
-                        category = "other"
-                    
-                    # Create category directory
-                    category_dir = Path(target_dir) / category
-                    os.makedirs(category_dir, exist_ok=True)
-                    
-                    # Move file
-                    target_path = category_dir / file_path.name
-                    if not target_path.exists():
-                        file_path.rename(target_path)
-                        file_count += 1
+            for file_path in _matching_files(source_path, file_pattern):
+                # Determine category based on extension
+                category = _EXT_CATEGORY.get(file_path.suffix.lower()[1:], "other")
+                category_dir = category_dirs[category]
+                
+                # Create category directory
+                if category_dir not in created_dirs:
+                    category_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(category_dir)
+                
+                # Move file
+                target_path = category_dir / file_path.name
+                if not target_path.exists():
+                    file_path.rename(target_path)
+                    file_count += 1
             
             return f"Organized {file_count} files into categories in {target_dir}"
         
@@ -150,11 +396,10 @@ class TaskAutomationTool(Tool):
             suffix = parameters.get("suffix", "")
             
             file_count = 0
-            for file_path in source_path.glob(file_pattern):
-                if file_path.is_file():
-                    new_name = f"{prefix}{file_path.stem}{suffix}{file_path.suffix}"
-                    file_path.rename(file_path.parent / new_name)
-                    file_count += 1
+            for file_path in _matching_files(source_path, file_pattern):
+                new_name = f"{prefix}{file_path.stem}{suffix}{file_path.suffix}"
+                file_path.rename(file_path.parent / new_name)
+                file_count += 1
             
             return f"Renamed {file_count} files in {source_dir}"
         
@@ -183,20 +428,28 @@ class TaskAutomationTool(Tool):
             current_time = time.time()
             max_age = days_old * 86400  # Convert days to seconds
             
-            removed_count = 0
+            to_delete = []
             skipped_count = 0
             
-            for file_path in target_path.glob("*"):
-                try:
-                    if file_path.is_file():
-                        file_age = current_time - file_path.stat().st_mtime
-                        if file_age > max_age:
-                            file_path.unlink()
-                            removed_count += 1
-                        else:
-                            skipped_count += 1
-                except (PermissionError, OSError):
-                    skipped_count += 1
+            with os.scandir(target_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            file_age = current_time - entry.stat(follow_symlinks=False).st_mtime
+                            if file_age > max_age:
+                                to_delete.append(entry.path)
+                            else:
+                                skipped_count += 1
+                    except (PermissionError, OSError):
+                        skipped_count += 1
+            
+            if len(to_delete) > _PARALLEL_UNLINK_THRESHOLD:
+                # unlink releases the GIL, so threads overlap the syscalls without forking the agent
+                with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+                    removed_count = sum(executor.map(_safe_unlink, to_delete))
+            else:
+                removed_count = sum(_safe_unlink(path) for path in to_delete)
+            skipped_count += len(to_delete) - removed_count
             
             return f"Cleaned up {removed_count} temporary files (skipped {skipped_count})"
         
@@ -210,21 +463,27 @@ class TaskAutomationTool(Tool):
             
             removed_count = 0
             
-            # First pass to identify empty directories
-            empty_dirs = []
-            for root, dirs, files in os.walk(target_path, topdown=False):
-                for dir_name in dirs:
-                    dir_path = Path(root) / dir_name
-                    if not any(dir_path.iterdir()):
-                        empty_dirs.append(dir_path)
-            
-            # Remove empty directories
-            for dir_path in empty_dirs:
+            def prune(path):
+                """Remove empty subdirectories bottom-up; return True if path is left empty"""
+                nonlocal removed_count
+                empty = True
                 try:
-                    dir_path.rmdir()
-                    removed_count += 1
+                    with os.scandir(path) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False) and prune(entry.path):
+                                try:
+                                    os.rmdir(entry.path)
+                                    removed_count += 1
+                                    continue
+                                except (PermissionError, OSError):
+                                    pass
+                            empty = False
                 except (PermissionError, OSError):
-                    pass
+                    return False
+                return empty
+            
+            # One scandir per directory; the target directory itself is kept
+            prune(target_path)
             
             return f"Removed {removed_count} empty directories"
         
@@ -240,40 +499,39 @@ class TaskAutomationTool(Tool):
             if not commands:
                 raise ToolExecutionError("No commands specified for batch processing")
             
+            try:
+                max_parallel = int(parameters.get("max_parallel", 16))
+            except (TypeError, ValueError):
+                raise ToolExecutionError("max_parallel must be an integer")
+            if max_parallel < 1:
+                raise ToolExecutionError("max_parallel must be at least 1")
+            max_parallel = min(max_parallel, _MAX_PARALLEL_COMMANDS)
+            
+            import asyncio
+            
+            # Commands are independent, so run them concurrently
+            outcomes = asyncio.run(_run_commands(
+                commands,
+                parameters.get("timeout", 60),
+                max_parallel
+            ))
+            
             results = []
-            for cmd in commands:
-                try:
-                    logger.info(f"Executing command: {cmd}")
-                    # Execute command and capture output
-                    result = subprocess.run(
-                        cmd, 
-                        shell=True, 
-                        capture_output=True, 
-                        text=True,
-                        timeout=parameters.get("timeout", 60)
-                    )
-                    
-                    status = "success" if result.returncode == 0 else "failed"
-                    results.append({
-                        "command": cmd,
-                        "status": status,
-                        "return_code": result.returncode,
-                        "output": result.stdout[:1000],  # Limit output size
-                        "error": result.stderr[:1000] if result.stderr else None
-                    })
-                    
-                except subprocess.TimeoutExpired:
+            for cmd, outcome in zip(commands, outcomes):
+                if isinstance(outcome, asyncio.TimeoutError):
                     results.append({
                         "command": cmd,
                         "status": "timeout",
                         "error": "Command execution timed out"
                     })
-                except Exception as e:
+                elif isinstance(outcome, Exception):
                     results.append({
                         "command": cmd,
                         "status": "error",
-                        "error": str(e)
+                        "error": str(outcome)
                     })
+                else:
+                    results.append(outcome)
             
             successful = sum(1 for r in results if r["status"] == "success")
             return f"Executed {len(commands)} commands ({successful} successful)"
@@ -292,37 +550,24 @@ class TaskAutomationTool(Tool):
             
             processed = 0
             
-            for file_path in source_path.glob(file_pattern):
-                if file_path.is_file():
+            if conversion_type in ("text_to_uppercase", "text_to_lowercase"):
+                # Files are independent, so convert them concurrently
+                files = _matching_files(source_path, file_pattern)
+                with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+                    processed = sum(executor.map(_convert_case, files, [conversion_type] * len(files)))
+            
+            elif conversion_type == "line_count":
+                for file_path in _matching_files(source_path, file_pattern):
                     try:
-                        # Handle different conversion types
-                        if conversion_type == "text_to_uppercase":
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(content.upper())
-                            processed += 1
-                            
-                        elif conversion_type == "text_to_lowercase":
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(content.lower())
-                            processed += 1
-                            
-                        elif conversion_type == "line_count":
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                line_count = sum(1 for _ in f)
-                            
-                            # Append line count to filename
-                            stats_dir = source_path / "file_stats"
-                            os.makedirs(stats_dir, exist_ok=True)
-                            
-                            with open(stats_dir / f"{file_path.name}_stats.txt", 'w') as f:
-                                f.write(f"Line count: {line_count}\n")
-                            processed += 1
+                        line_count = _count_lines(file_path)
+                        
+                        # Append line count to filename
+                        stats_dir = source_path / "file_stats"
+                        os.makedirs(stats_dir, exist_ok=True)
+                        
+                        with open(stats_dir / f"{file_path.name}_stats.txt", 'w') as f:
+                            f.write(f"Line count: {line_count}\n")
+                        processed += 1
                     
                     except Exception as e:
                         logger.error(f"Error processing file {file_path}: {e}")
@@ -346,8 +591,17 @@ class TaskAutomationTool(Tool):
         
         # Create backup directory if it doesn't exist
         backup_path = Path(backup_dir)
+        source_resolved = source_path.resolve()
+        backup_resolved = backup_path.resolve()
+        if backup_resolved == source_resolved:
+            raise ToolExecutionError("Backup directory must not be the source directory")
         os.makedirs(backup_path, exist_ok=True)
         
+        # A backup root inside the source (the default "." / "backups") must not be copied into itself
+        exclude = None
+        if source_resolved in backup_resolved.parents:
+            exclude = os.path.join(source_path, backup_resolved.relative_to(source_resolved))
+        
         # Create timestamped backup folder
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = parameters.get("backup_name", source_path.name)
@@ -358,65 +612,49 @@ class TaskAutomationTool(Tool):
         backup_type = parameters.get("backup_type", "full")
         
         if backup_type == "full":
-            # Use system commands for copying
-            if os.name == "nt":  # Windows
-                cmd = f'xcopy "{source_path}" "{backup_folder}" /E /H /C /I'
-            else:  # Linux/Mac
-                cmd = f'cp -r "{source_path}"/* "{backup_folder}"/'
-            
-            subprocess.run(cmd, shell=True, check=True)
-            
-            # Count files backed up
-            file_count = sum(1 for _ in backup_folder.glob("**/*") if _.is_file())
+            # Copy in-process, counting files as they are copied
+            file_count = _copy_tree(source_path, backup_folder, exclude)
             return f"Full backup created at {backup_folder} ({file_count} files)"
         
         elif backup_type == "incremental":
             # For incremental, we need the last backup timestamp
-            previous_backups = sorted([d for d in backup_path.glob(f"{backup_name}_*") if d.is_dir()])
+            previous_backups = []
+            for d in backup_path.glob(f"{backup_name}_*"):
+                match = _BACKUP_TS_RE.search(d.name)
+                # Skip the folder created for this run and backups of other names sharing the prefix
+                if match and d != backup_folder and d.name[:match.start()] == backup_name and d.is_dir():
+                    previous_backups.append(match.group(1))
             
             if not previous_backups:
-                # If no previous backup, do a full backup
-                if os.name == "nt":  # Windows
-                    cmd = f'xcopy "{source_path}" "{backup_folder}" /E /H /C /I'
-                else:  # Linux/Mac
-                    cmd = f'cp -r "{source_path}"/* "{backup_folder}"/'
-                
-                subprocess.run(cmd, shell=True, check=True)
-                
-                file_count = sum(1 for _ in backup_folder.glob("**/*") if _.is_file())
+                # If no previous backup, do a full backup, counting files as they are copied
+                file_count = _copy_tree(source_path, backup_folder, exclude)
                 return f"Initial backup created at {backup_folder} ({file_count} files)"
             
             # Get last backup time from folder name
-            last_backup = previous_backups[-1]
-            last_backup_time_str = last_backup.name.split("_")[-2] + "_" + last_backup.name.split("_")[-1]
-            
             try:
-                last_backup_time = datetime.strptime(last_backup_time_str, "%Y%m%d_%H%M%S")
-                # Convert to timestamp
-                last_backup_timestamp = last_backup_time.timestamp()
+                last_backup_timestamp = time.mktime(time.strptime(max(previous_backups), "%Y%m%d_%H%M%S"))
             except ValueError:
                 # If we can't parse the time, default to 24 hours ago
                 last_backup_timestamp = time.time() - 86400
             
             # Copy only newer files
-            copied_count = 0
-            for file_path in source_path.glob("**/*"):
-                if file_path.is_file():
-                    # Check if file is newer than last backup
-                    mod_time = file_path.stat().st_mtime
-                    if mod_time > last_backup_timestamp:
-                        # Calculate relative path
-                        rel_path = file_path.relative_to(source_path)
-                        target_path = backup_folder / rel_path
-                        
-                        # Create parent directories
+            created_dirs = set()
+            with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+                copies = []
+                for file_path, rel_path, _ in _walk_newer(source_path, last_backup_timestamp, exclude):
+                    target_path = backup_folder / rel_path
+                    
+                    # Create parent directories once per directory
+                    if target_path.parent not in created_dirs:
                         os.makedirs(target_path.parent, exist_ok=True)
-                        
-                        # Copy file
-                        with open(file_path, "rb") as src, open(target_path, "wb") as dst:
-                            dst.write(src.read())
-                        
-                        copied_count += 1
+                        created_dirs.add(target_path.parent)
+                    
+                    # Copy file (kernel-side copy where the platform supports it)
+                    copies.append(executor.submit(_reflink_or_copy, file_path, target_path))
+                
+                for copy in copies:
+                    copy.result()
+            copied_count = len(copies)
             
             if copied_count == 0:
                 # Remove empty backup directory if no files were copied
@@ -440,24 +678,20 @@ class TaskAutomationTool(Tool):
         if schedule == "hourly":
             next_run = now.replace(minute=0, second=0, microsecond=0)
             # Move to next hour if current time is past the hour mark
-            if now.minute > 0 or now.second > 0:
-                next_run = next_run.replace(hour=now.hour + 1)
+            if next_run < now:
+                next_run += timedelta(hours=1)
         elif schedule == "daily":
             next_run = now.replace(hour=0, minute=0, second=0, microsecond=0)
             # Move to next day if current time is past midnight
-            if now.hour > 0 or now.minute > 0 or now.second > 0:
-                # Add one day
-                next_run = next_run.replace(day=now.day + 1)
+            if next_run < now:
+                next_run += timedelta(days=1)
         elif schedule == "weekly":
             # Schedule for next Monday at midnight
+            next_run = now.replace(hour=0, minute=0, second=0, microsecond=0)
             days_until_monday = (7 - now.weekday()) % 7
-            if days_until_monday == 0 and (now.hour > 0 or now.minute > 0 or now.second > 0):
+            if days_until_monday == 0 and next_run < now:
                 days_until_monday = 7  # If today is Monday and time > 00:00:00, schedule for next Monday
-            
-            # Add days until next Monday
-            next_run = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            # Add days_until_monday days
-            next_run = next_run.replace(day=now.day + days_until_monday)
+            next_run += timedelta(days=days_until_monday)
         else:
             raise ToolExecutionError(f"Unsupported schedule: {schedule}")
         
@@ -473,25 +707,42 @@ class TaskAutomationTool(Tool):
         }
         
         task_file = tasks_dir / f"{task_id}.json"
-        with open(task_file, "w") as f:
-            json.dump(task_data, f, indent=2)
+        if orjson is not None:
+            task_file.write_bytes(orjson.dumps(task_data, option=orjson.OPT_INDENT_2))
+        else:
+            import json
+            task_file.write_text(json.dumps(task_data, indent=2))
         
         return f"Task {task_id} scheduled for {next_run.isoformat()} ({schedule})"
     
-    def _record_task_event(self, task_id, status, details):
-        """Record task events to history file"""
+    def _record_task_event(self, task_id, status, details, timestamp=None):
+        """Append a task event to the NDJSON history log"""
         event_data = {
             "task_id": task_id,
             "status": status,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "details": details
         }
         
-        history_file = self.task_history_dir / f"{task_id}_{status}.json"
-        with open(history_file, "w") as f:
-            json.dump(event_data, f, indent=2)
-        
-        # Also append to combined log
-        log_file = self.task_history_dir / "task_history.log"
-        with open(log_file, "a") as f:
-            f.write(f"{datetime.now().isoformat()} - Task {task_id} {status}\n")
\ No newline at end of file
+        if orjson is not None:
+            line = orjson.dumps(event_data)
+        else:
+            import json
+            line = json.dumps(event_data).encode("utf-8")
+        # One write syscall per record, so readers and crash recovery see every event
+        self._events_fp.write(line + b"\n")
+        self._events_fp.flush()
+        now = time.monotonic()
+        if now - self._events_synced_at >= _EVENTS_FSYNC_INTERVAL:
+            os.fsync(self._events_fp.fileno())
+            self._events_synced_at = now
+    
+    def _close_events_log(self):
+        """Flush and fsync the task event log"""
+        if self._events_fp.closed:
+            return
+        try:
+            self._events_fp.flush()
+            os.fsync(self._events_fp.fileno())
+        finally:
+            self._events_fp.close()
@@ -1,11 +1,31 @@
+import hashlib
+import json
 import logging
 import requests
-from typing import Dict, List, Any, Optional, Union
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from cachetools import TTLCache
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Union
+from ._http import get_session
 from .base_tool import Tool, ToolExecutionError
 
+# Try importing orjson for faster JSON encoding and decoding, fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: parse extract responses incrementally instead of buffering the whole body
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger("gemini_agent")
 
+# Per-URL extract requests in flight at once; kept below the session's pool_maxsize
+EXTRACT_MAX_WORKERS = 8
+
 class TavilyTool(Tool):
     """Tool for performing Tavily searches and URL content extraction"""
     
@@ -89,12 +109,26 @@ class TavilyTool(Tool):
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # Shared pooled session; auth goes in per-request headers since other tools use it too
+        self.session = get_session()
+        # Agents often repeat a search within a session; serve repeats for a few minutes
+        self._search_cache = TTLCache(maxsize=512, ttl=300)
+        self._cache_lock = Lock()
+
+    def clear_cache(self):
+        """Drop all cached search responses"""
+        with self._cache_lock:
+            self._search_cache.clear()
 
     def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Make request to Tavily API with error handling"""
         try:
             url = f"{self.base_url}/{endpoint}"
-            response = requests.post(url, json=payload, headers=self.headers)
+            if orjson is not None:
+                response = self.session.post(url, data=orjson.dumps(payload), headers=self.headers)
+                response.raise_for_status()
+                return orjson.loads(response.content)
+            response = self.session.post(url, json=payload, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -102,6 +136,19 @@ class TavilyTool(Tool):
         except ValueError as e:
             raise ToolExecutionError(f"Invalid JSON response: {str(e)}")
 
+    def _stream_results(self, endpoint: str, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield items of the response's "results" array as they are parsed off the wire"""
+        try:
+            url = f"{self.base_url}/{endpoint}"
+            with self.session.post(url, json=payload, headers=self.headers, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "results.item")
+        except requests.exceptions.RequestException as e:
+            raise ToolExecutionError(f"Tavily API error: {str(e)}")
+        except ijson.JSONError as e:
+            raise ToolExecutionError(f"Invalid JSON response: {str(e)}")
+
     def search(self, 
               query: str,
               search_depth: str = "advanced",
@@ -128,8 +175,25 @@ class TavilyTool(Tool):
         
         if include_domains:
             payload["include_domains"] = include_domains
-            
-        return self._make_request("search", payload)
+        
+        # Raw page content is large, so those responses are not worth caching
+        if include_raw_content:
+            return self._make_request("search", payload)
+        
+        if orjson is not None:
+            encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            encoded = json.dumps(payload, sort_keys=True).encode()
+        key = hashlib.blake2b(encoded).hexdigest()
+        with self._cache_lock:
+            cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._make_request("search", payload)
+        with self._cache_lock:
+            self._search_cache[key] = result
+        return result
 
     def extract(self,
                 urls: Union[str, List[str]],
@@ -148,40 +212,83 @@ class TavilyTool(Tool):
             "extract_depth": extract_depth
         }
         
+        if len(urls) > 1:
+            # Fan out one request per URL so the batch takes about as long as the slowest URL
+            with ThreadPoolExecutor(max_workers=min(EXTRACT_MAX_WORKERS, len(urls))) as executor:
+                responses = executor.map(
+                    lambda url: self._make_request("extract", {**payload, "urls": [url]}),
+                    urls
+                )
+                return self._merge_extract_responses(responses)
+        
         return self._make_request("extract", payload)
 
+    def iter_extract(self,
+                     urls: Union[str, List[str]],
+                     include_images: bool = False,
+                     extract_depth: str = "advanced") -> Iterator[Dict[str, Any]]:
+        """
+        Extract content from URLs, yielding each result as soon as it is parsed
+        """
+        if ijson is None:
+            return iter(self.extract(urls, include_images, extract_depth).get("results", []))
+        
+        if isinstance(urls, str):
+            urls = [urls]
+            
+        payload = {
+            "urls": urls,
+            "include_images": include_images,
+            "extract_depth": extract_depth
+        }
+        
+        return self._stream_results("extract", payload)
+
+    def _merge_extract_responses(self, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-URL extract responses into a single response"""
+        merged = {"results": [], "failed_results": []}
+        for response in responses:
+            merged["results"].extend(response.get("results", []))
+            merged["failed_results"].extend(response.get("failed_results", []))
+        return merged
+
     def _format_search_results(self, results: Dict[str, Any]) -> str:
         """Format search results for readable output"""
-        output = []
+        def _lines():
+            if "answer" in results:
+                yield f"AI Answer: {results['answer']}\n"
+            if "results" in results:
+                yield "Search Results:"
+                for idx, result in enumerate(results["results"], 1):
+                    title = result.get("title") or "No title"
+                    url = result.get("url") or "No URL"
+                    content = result.get("content") or "No content"
+                    yield f"\n{idx}. {title}"
+                    yield "   URL: " + url
+                    yield "   Content: " + content + "\n"
         
-        if "answer" in results:
-            output.append(f"AI Answer: {results['answer']}\n")
-            
-        if "results" in results:
-            output.append("Search Results:")
-            for idx, result in enumerate(results["results"], 1):
-                output.append(f"\n{idx}. {result.get('title', 'No title')}")
-                output.append(f"   URL: {result.get('url', 'No URL')}")
-                output.append(f"   Content: {result.get('content', 'No content')}\n")
-                
-        return "\n".join(output)
+        return "\n".join(_lines())
 
-    def _format_extract_results(self, results: Dict[str, Any]) -> str:
+    def _format_extract_results(self, results: Union[Dict[str, Any], Iterable[Dict[str, Any]]]) -> str:
         """Format extraction results for readable output"""
-        output = ["Extracted Content:"]
+        def _lines():
+            yield "Extracted Content:"
+            if isinstance(results, dict) and "results" not in results:
+                yield "URL: " + (results.get("url") or "No URL")
+                yield "Title: " + (results.get("title") or "No title")
+                yield "Content: " + (results.get("content") or "No content")
+            else:
+                items = results["results"] if isinstance(results, dict) else results
+                for idx, result in enumerate(items, 1):
+                    url = result.get("url") or "No URL"
+                    title = result.get("title") or "No title"
+                    content = result.get("content") or result.get("raw_content") or "No content"
+                    yield f"\nSource {idx}:"
+                    yield "URL: " + url
+                    yield "Title: " + title
+                    yield "Content: " + content + "\n"
         
-        if isinstance(results, list):
-            for idx, result in enumerate(results, 1):
-                output.append(f"\nSource {idx}:")
-                output.append(f"URL: {result.get('url', 'No URL')}")
-                output.append(f"Title: {result.get('title', 'No title')}")
-                output.append(f"Content: {result.get('content', 'No content')}\n")
-        else:
-            output.append(f"URL: {results.get('url', 'No URL')}")
-            output.append(f"Title: {results.get('title', 'No title')}")
-            output.append(f"Content: {results.get('content', 'No content')}")
-            
-        return "\n".join(output)
+        return "\n".join(_lines())
 
     def execute(self, **kwargs) -> str:
         """Execute the Tavily tool based on provided parameters"""
@@ -210,11 +317,18 @@ class TavilyTool(Tool):
                 if not kwargs.get("urls"):
                     raise ToolExecutionError("urls is required for EXTRACT operation")
                     
-                result = self.extract(
-                    urls=kwargs["urls"],
-                    include_images=kwargs.get("include_images", False),
-                    extract_depth=kwargs.get("extract_depth", "advanced")
-                )
+                urls = kwargs["urls"]
+                include_images = kwargs.get("include_images", False)
+                extract_depth = kwargs.get("extract_depth", "advanced")
+                if isinstance(urls, list) and len(urls) > 1:
+                    result = self.extract(urls, include_images, extract_depth)
+                else:
+                    # Format results while the rest of the body is still downloading
+                    result = self.iter_extract(
+                        urls=urls,
+                        include_images=include_images,
+                        extract_depth=extract_depth
+                    )
                 return self._format_extract_results(result)
                 
             else:
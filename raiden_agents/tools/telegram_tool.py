@@ -1,13 +1,33 @@
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Union
-from datetime import datetime
-from telegram import Bot, Update, Message, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
+import functools
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Union
+from pathlib import Path
 from .base_tool import Tool, ToolExecutionError
 
+if TYPE_CHECKING:
+    from telegram import Message, InlineKeyboardMarkup
+
 logger = logging.getLogger("gemini_agent")
 
+# Upper bound on how long execute() waits for a single Telegram operation
+OPERATION_TIMEOUT = 300
+# Concurrent sends per bulk broadcast, kept under Telegram's rate limits
+BULK_SEND_CONCURRENCY = 20
+# Large documents need longer than the library's default socket timeouts to upload
+UPLOAD_READ_TIMEOUT = 60
+UPLOAD_WRITE_TIMEOUT = 240
+
+@functools.lru_cache(maxsize=128)
+def _button_markup(text: str, callback_data: str) -> "InlineKeyboardMarkup":
+    """Build a single-button keyboard; markups are immutable, so repeats share one object"""
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    button = InlineKeyboardButton(text=text, callback_data=callback_data)
+    return InlineKeyboardMarkup([[button]])
+
 class TelegramTool(Tool):
     """Tool for Telegram bot operations and messaging"""
     
@@ -23,6 +43,7 @@ class TelegramTool(Tool):
                         "description": "The operation to perform",
                         "enum": [
                             "SEND_MESSAGE",
+                            "SEND_MESSAGE_BULK",
                             "SEND_PHOTO",
                             "SEND_DOCUMENT",
                             "CREATE_POLL",
@@ -43,8 +64,14 @@ class TelegramTool(Tool):
                     },
                     "chat_id": {
                         "type": "string",
-                        "description": "Target chat ID for the operation",
-                        "optional": False
+                        "description": "Target chat ID for the operation (not used by SEND_MESSAGE_BULK)",
+                        "optional": True
+                    },
+                    "chat_ids": {
+                        "type": "array",
+                        "description": "Target chat IDs for SEND_MESSAGE_BULK",
+                        "items": {"type": "string"},
+                        "optional": True
                     },
                     "message_text": {
                         "type": "string",
@@ -100,24 +127,39 @@ class TelegramTool(Tool):
                         "optional": True
                     }
                 },
-                "required": ["operation", "chat_id"]
+                "required": ["operation"]
             }
         )
         self.bot_token = bot_token
+        # python-telegram-bot is heavy to import, so only load it once the tool is used
+        from telegram import Bot
         self.bot = Bot(token=bot_token)
+        self._initialized = False
+        # All operations run on one long-lived loop so the bot's HTTP connections persist
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="telegram-tool-loop", daemon=True).start()
+
+    def _run(self, coro):
+        """Run a coroutine on the shared event loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=OPERATION_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
         
-    async def _init_bot(self):
-        """Initialize bot instance asynchronously"""
-        if not hasattr(self, '_bot'):
-            self._bot = await Bot(self.bot_token).initialize()
-        return self._bot
+    async def _ensure_init(self):
+        """Initialize the bot once; later calls reuse it and its connection pool"""
+        if not self._initialized:
+            await self.bot.initialize()
+            self._initialized = True
 
     async def send_message(self, chat_id: str, text: str, 
-                          reply_markup: Optional[InlineKeyboardMarkup] = None) -> Message:
+                          reply_markup: Optional["InlineKeyboardMarkup"] = None) -> "Message":
         """Send a text message to a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            return await bot.send_message(
+            return await self.bot.send_message(
                 chat_id=chat_id,
                 text=text,
                 reply_markup=reply_markup,
@@ -126,40 +168,59 @@ class TelegramTool(Tool):
         except Exception as e:
             raise ToolExecutionError(f"Failed to send message: {str(e)}")
 
+    async def send_message_bulk(self, chat_ids: List[str], text: str) -> List[Union["Message", Exception]]:
+        """Send the same text message to many chats concurrently"""
+        await self._ensure_init()
+        semaphore = asyncio.Semaphore(BULK_SEND_CONCURRENCY)
+        
+        async def send_one(chat_id):
+            async with semaphore:
+                return await self.send_message(chat_id, text)
+        
+        # One failing chat shouldn't abort the rest of the broadcast
+        return await asyncio.gather(*(send_one(c) for c in chat_ids), return_exceptions=True)
+
     async def send_photo(self, chat_id: str, photo_path: str, 
-                        caption: Optional[str] = None) -> Message:
+                        caption: Optional[str] = None) -> "Message":
         """Send a photo to a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            with open(photo_path, 'rb') as photo:
-                return await bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo,
-                    caption=caption
-                )
+            # Read the file on a worker thread so large uploads don't stall the event loop
+            photo = await asyncio.to_thread(Path(photo_path).read_bytes)
+            return await self.bot.send_photo(
+                chat_id=chat_id,
+                photo=photo,
+                caption=caption,
+                filename=os.path.basename(photo_path)
+            )
         except Exception as e:
             raise ToolExecutionError(f"Failed to send photo: {str(e)}")
 
     async def send_document(self, chat_id: str, document_path: str, 
-                          caption: Optional[str] = None) -> Message:
+                          caption: Optional[str] = None) -> "Message":
         """Send a document to a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            with open(document_path, 'rb') as document:
-                return await bot.send_document(
-                    chat_id=chat_id,
-                    document=document,
-                    caption=caption
-                )
+            # InputFile buffers its content in memory anyway, so one off-loop read passed as
+            # bytes is the cheapest form: no file handle for the library to read and copy
+            document = await asyncio.to_thread(Path(document_path).read_bytes)
+            return await self.bot.send_document(
+                chat_id=chat_id,
+                document=document,
+                caption=caption,
+                filename=os.path.basename(document_path),
+                read_timeout=UPLOAD_READ_TIMEOUT,
+                write_timeout=UPLOAD_WRITE_TIMEOUT
+            )
         except Exception as e:
             raise ToolExecutionError(f"Failed to send document: {str(e)}")
 
     async def create_poll(self, chat_id: str, question: str, 
-                         options: List[str], is_anonymous: bool = True) -> Message:
+                         options: List[str], is_anonymous: bool = True) -> "Message":
         """Create a poll in a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            return await bot.send_poll(
+            return await self.bot.send_poll(
                 chat_id=chat_id,
                 question=question,
                 options=options,
@@ -168,34 +229,33 @@ class TelegramTool(Tool):
         except Exception as e:
             raise ToolExecutionError(f"Failed to create poll: {str(e)}")
 
-    async def create_button(self, text: str, callback_data: str) -> InlineKeyboardMarkup:
+    async def create_button(self, text: str, callback_data: str) -> "InlineKeyboardMarkup":
         """Create an inline keyboard button"""
         try:
-            button = InlineKeyboardButton(text=text, callback_data=callback_data)
-            return InlineKeyboardMarkup([[button]])
+            return _button_markup(text, callback_data)
         except Exception as e:
             raise ToolExecutionError(f"Failed to create button: {str(e)}")
 
     async def get_chat_info(self, chat_id: str) -> Dict[str, Any]:
         """Get information about a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            chat = await bot.get_chat(chat_id)
+            chat = await self.bot.get_chat(chat_id)
             return {
                 "id": chat.id,
                 "type": chat.type,
                 "title": chat.title,
                 "description": chat.description,
-                "member_count": await bot.get_chat_member_count(chat_id)
+                "member_count": await self.bot.get_chat_member_count(chat_id)
             }
         except Exception as e:
             raise ToolExecutionError(f"Failed to get chat info: {str(e)}")
 
     async def pin_message(self, chat_id: str, message_id: int) -> bool:
         """Pin a message in a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            return await bot.pin_chat_message(
+            return await self.bot.pin_chat_message(
                 chat_id=chat_id,
                 message_id=message_id
             )
@@ -204,9 +264,9 @@ class TelegramTool(Tool):
 
     async def unpin_message(self, chat_id: str, message_id: int) -> bool:
         """Unpin a message in a chat"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            return await bot.unpin_chat_message(
+            return await self.bot.unpin_chat_message(
                 chat_id=chat_id,
                 message_id=message_id
             )
@@ -215,22 +275,22 @@ class TelegramTool(Tool):
 
     async def set_bot_commands(self, commands: List[Dict[str, str]]) -> bool:
         """Set bot commands"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
             command_list = [
                 (command["command"], command["description"])
                 for command in commands
             ]
-            return await bot.set_my_commands(command_list)
+            return await self.bot.set_my_commands(command_list)
         except Exception as e:
             raise ToolExecutionError(f"Failed to set bot commands: {str(e)}")
 
     async def create_chat_invite(self, chat_id: str, 
                                expire_date: Optional[int] = None) -> str:
         """Create chat invite link"""
-        bot = await self._init_bot()
+        await self._ensure_init()
         try:
-            invite = await bot.create_chat_invite_link(
+            invite = await self.bot.create_chat_invite_link(
                 chat_id=chat_id,
                 expire_date=expire_date
             )
@@ -244,23 +304,42 @@ class TelegramTool(Tool):
         operation = kwargs.get("operation")
         chat_id = kwargs.get("chat_id")
         
-        # Create event loop for async operations
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
+            if operation != "SEND_MESSAGE_BULK" and not chat_id:
+                raise ToolExecutionError(f"chat_id is required for {operation} operation")
+
             if operation == "SEND_MESSAGE":
                 if not kwargs.get("message_text"):
                     raise ToolExecutionError("message_text is required for SEND_MESSAGE operation")
-                result = loop.run_until_complete(
+                result = self._run(
                     self.send_message(chat_id, kwargs["message_text"])
                 )
                 return f"Message sent successfully. Message ID: {result.message_id}"
 
+            elif operation == "SEND_MESSAGE_BULK":
+                chat_ids = kwargs.get("chat_ids")
+                if not (chat_ids and kwargs.get("message_text")):
+                    raise ToolExecutionError("chat_ids and message_text are required for SEND_MESSAGE_BULK operation")
+                if not isinstance(chat_ids, (list, tuple)) or not all(
+                    isinstance(c, (str, int)) and not isinstance(c, bool) for c in chat_ids
+                ):
+                    raise ToolExecutionError("chat_ids must be a list of chat IDs (strings or integers)")
+                results = self._run(
+                    self.send_message_bulk(chat_ids, kwargs["message_text"])
+                )
+                failed = [
+                    f"{c}: {r}" for c, r in zip(chat_ids, results)
+                    if isinstance(r, Exception)
+                ]
+                summary = f"Message sent to {len(chat_ids) - len(failed)} of {len(chat_ids)} chats."
+                if failed:
+                    summary += " Failures:\n" + "\n".join(failed)
+                return summary
+
             elif operation == "SEND_PHOTO":
                 if not kwargs.get("photo_path"):
                     raise ToolExecutionError("photo_path is required for SEND_PHOTO operation")
-                result = loop.run_until_complete(
+                result = self._run(
                     self.send_photo(
                         chat_id,
                         kwargs["photo_path"],
@@ -269,10 +348,22 @@ class TelegramTool(Tool):
                 )
                 return f"Photo sent successfully. Message ID: {result.message_id}"
 
+            elif operation == "SEND_DOCUMENT":
+                if not kwargs.get("document_path"):
+                    raise ToolExecutionError("document_path is required for SEND_DOCUMENT operation")
+                result = self._run(
+                    self.send_document(
+                        chat_id,
+                        kwargs["document_path"],
+                        kwargs.get("message_text")
+                    )
+                )
+                return f"Document sent successfully. Message ID: {result.message_id}"
+
             elif operation == "CREATE_POLL":
                 if not (kwargs.get("poll_question") and kwargs.get("poll_options")):
                     raise ToolExecutionError("poll_question and poll_options are required for CREATE_POLL operation")
-                result = loop.run_until_complete(
+                result = self._run(
                     self.create_poll(
                         chat_id,
                         kwargs["poll_question"],
@@ -282,13 +373,13 @@ class TelegramTool(Tool):
                 return f"Poll created successfully. Message ID: {result.message_id}"
 
             elif operation == "GET_CHAT_INFO":
-                result = loop.run_until_complete(self.get_chat_info(chat_id))
+                result = self._run(self.get_chat_info(chat_id))
                 return f"Chat info retrieved: {result}"
 
             elif operation == "PIN_MESSAGE":
                 if not kwargs.get("message_id"):
                     raise ToolExecutionError("message_id is required for PIN_MESSAGE operation")
-                result = loop.run_until_complete(
+                result = self._run(
                     self.pin_message(chat_id, kwargs["message_id"])
                 )
                 return "Message pinned successfully" if result else "Failed to pin message"
@@ -296,7 +387,7 @@ class TelegramTool(Tool):
             elif operation == "SET_BOT_COMMANDS":
                 if not kwargs.get("commands"):
                     raise ToolExecutionError("commands are required for SET_BOT_COMMANDS operation")
-                result = loop.run_until_complete(
+                result = self._run(
                     self.set_bot_commands(kwargs["commands"])
                 )
                 return "Bot commands set successfully" if result else "Failed to set bot commands"
@@ -306,8 +397,6 @@ class TelegramTool(Tool):
 
         except Exception as e:
             raise ToolExecutionError(f"Error executing Telegram tool: {str(e)}")
-        finally:
-            loop.close()
 
     def _format_result(self, result: Any) -> str:
         """Format the operation result for output"""
@@ -1,14 +1,75 @@
 import logging
 from dotenv import load_dotenv
 import os
+import queue
 import requests
+import threading
+import time
+from cachetools import TTLCache
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from .base_tool import Tool, ToolExecutionError, VectorDBError
+from .base_tool import Tool, ToolExecutionError, VectorDBError, get_vector_db
 
 logger = logging.getLogger("gemini_agent")
 
 load_dotenv()
 
+# Searches arriving within this window (seconds) are embedded together in one batch
+BATCH_WINDOW = 0.005
+MAX_BATCH = 16
+# Upper bound on how long execute() waits for its batched search to come back
+BATCH_RESULT_TIMEOUT = 30
+
+# Queries made only of these words carry no signal worth an embedding pass
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i", "in",
+    "is", "it", "me", "my", "of", "on", "or", "that", "the", "this", "to", "was",
+    "we", "what", "when", "where", "who", "why", "with", "you"
+})
+
+class _BatchQueue:
+    """Coalesce searches that arrive close together into one vector_db.search_batch call"""
+
+    def __init__(self, vector_db):
+        self._vector_db = vector_db
+        self._queue = queue.Queue()
+        threading.Thread(target=self._worker, name="vdb-batch-queue", daemon=True).start()
+
+    def submit(self, query, top_k):
+        future = Future()
+        self._queue.put((query, top_k, future))
+        return future
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self._vector_db.search_batch(
+                    [q for q, _, _ in batch],
+                    top_k=max(k for _, k, _ in batch)
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, k, future), matches in zip(batch, results):
+                future.set_result(matches[:k])
+            # A short result list must not leave callers waiting on futures nobody will resolve
+            for _, _, future in batch[len(results):]:
+                future.set_exception(VectorDBError(
+                    f"search_batch returned {len(results)} result sets for {len(batch)} queries"
+                ))
+
 class VectorSearchTool(Tool):
     def __init__(self):
         super().__init__(
@@ -29,37 +90,73 @@ class VectorSearchTool(Tool):
             },
             required=["query"]
         )
+        self._batch_queue = None
+        self._batch_lock = threading.Lock()
+        # Agents often repeat the same lookup while reasoning; skip the embed + ANN round trip
+        self._cache = TTLCache(maxsize=256, ttl=120)
+        # cachetools caches are not thread-safe; concurrent callers share this one
+        self._cache_lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop cached search results, e.g. after writing to the vector DB"""
+        with self._cache_lock:
+            self._cache.clear()
 
     def execute(self, **kwargs):
         self.validate_args(kwargs)
         query = kwargs.get("query")
         count = kwargs.get("results_count", 3)
 
-        try:
-            from __main__ import vector_db
-            if not vector_db or not vector_db.is_ready():
-                raise ToolExecutionError("Vector DB unavailable.")
+        normalized = (query or "").strip().lower()
+        if len(normalized) < 3 or STOP_WORDS.issuperset(normalized.split()):
+            return "No relevant info found in memory."
 
-            try:
+        vector_db = get_vector_db()
+        if vector_db is None:
+            raise ToolExecutionError("Vector DB not initialized in main application.")
+        if not vector_db.is_ready():
+            raise ToolExecutionError("Vector DB unavailable.")
+
+        # Include the VDB's write generation, when it has one, so writes invalidate the cache
+        key = (normalized, count, getattr(vector_db, "version", None))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            # Batch embedding needs a VDB that exposes search_batch; otherwise search one at a time
+            if hasattr(vector_db, "search_batch"):
+                with self._batch_lock:
+                    if self._batch_queue is None:
+                        self._batch_queue = _BatchQueue(vector_db)
+                try:
+                    results = self._batch_queue.submit(query, count).result(timeout=BATCH_RESULT_TIMEOUT)
+                except FutureTimeoutError:
+                    raise VectorDBError(f"Batched search timed out after {BATCH_RESULT_TIMEOUT}s")
+            else:
                 results = vector_db.search(query, top_k=count)
-                if not results:
-                    return "No relevant info found in memory."
-
-                formatted = [
-                    f"Memory {i+1} (Relevance: {r['similarity']:.2f}):\n"
-                    f"Metadata: {r.get('metadata', {})}\n"
-                    f"Content: {r['text']}"
-                    for i, r in enumerate(results)
-                ]
-                
-                return "Semantic Memory Search Results:\n\n" + "\n\n---\n\n".join(formatted)
-
-            except VectorDBError as e:
-                logger.error(f"VDB search failed: {e}")
-                raise ToolExecutionError(f"Error searching memory: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected VDB search error: {e}")
-                raise ToolExecutionError(f"Unexpected error searching memory: {e}")
+            if not results:
+                output = "No relevant info found in memory."
+                with self._cache_lock:
+                    self._cache[key] = output
+                return output
+
+            formatted = [
+                f"Memory {i+1} (Relevance: {r['similarity']:.2f}):\n"
+                f"Metadata: {r.get('metadata', {})}\n"
+                f"Content: {r['text']}"
+                for i, r in enumerate(results)
+            ]
+            
+            output = "Semantic Memory Search Results:\n\n" + "\n\n---\n\n".join(formatted)
+            with self._cache_lock:
+                self._cache[key] = output
+            return output
 
-        except ImportError:
-            raise ToolExecutionError("Vector DB not initialized in main application.")
\ No newline at end of file
+        except VectorDBError as e:
+            logger.error(f"VDB search failed: {e}")
+            raise ToolExecutionError(f"Error searching memory: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected VDB search error: {e}")
+            raise ToolExecutionError(f"Unexpected error searching memory: {e}")
@@ -3,10 +3,17 @@ import os
 import base64
 import json
 import mimetypes
+import mmap
+import functools
+import hashlib
 import requests
 import io
 from dotenv import load_dotenv
 from pathlib import Path
+from urllib.parse import urlparse
+import re
+import tempfile
+import time
 import traceback
 from .base_tool import Tool, ToolExecutionError
 
@@ -17,6 +24,12 @@ try:
 except ImportError:
     litellm = None
 
+# Optional: SIMD base64 encoder, several times faster than the stdlib on large videos
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
 logger = logging.getLogger("gemini_agent")
 
 # Supported MIME types based on Gemini documentation
@@ -26,9 +39,144 @@ SUPPORTED_VIDEO_MIME_TYPES = {
 }
 # Max size for inline data (conservative estimate under 20MB)
 MAX_INLINE_SIZE_BYTES = 19 * 1024 * 1024
+# Extension fallback for types mimetypes misses or reports differently (e.g. .mov -> video/quicktime)
+_EXT_MIME = {
+    '.mp4': 'video/mp4', '.mov': 'video/mov', '.avi': 'video/avi',
+    '.webm': 'video/webm', '.mpg': 'video/mpg', '.wmv': 'video/wmv'
+}
+# Videos at least this large go through litellm's file upload (when available) instead of base64
+UPLOAD_THRESHOLD_BYTES = 4 * 1024 * 1024
+# Downloaded URL videos are kept here, keyed by SHA-256 of the URL, so repeat questions skip the fetch
+VIDEO_CACHE_DIR = Path(os.environ.get("RAIDEN_VIDEO_CACHE_DIR", Path.home() / ".cache" / "raiden" / "videos"))
+# Cache bounds: entries past the TTL are misses, and the least recently used are pruned past either cap
+VIDEO_CACHE_MAX_BYTES = 512 * 1024 * 1024
+VIDEO_CACHE_MAX_ENTRIES = 64
+VIDEO_CACHE_TTL = 24 * 60 * 60
+# Download granularity for URL videos; larger chunks mean fewer Python-level iterations
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# litellm is the default path for every video. Setting this (or use_genai_sdk=True) sends non-YouTube
+# videos to google.generativeai as raw bytes instead, bypassing litellm's upload and inline encoding
+USE_GENAI_SDK = os.environ.get("RAIDEN_VIDEO_USE_GENAI_SDK", "").lower() in ("1", "true", "yes")
+
+@functools.lru_cache(maxsize=256)
+def _guess_mime(suffix):
+    """Guess a supported video MIME type from a lowercase file extension"""
+    mime_type, _ = mimetypes.guess_type("video" + suffix)
+    if mime_type in SUPPORTED_VIDEO_MIME_TYPES:
+        return mime_type
+    return _EXT_MIME.get(suffix, mime_type)
+
+def _sniff_video_mime(head):
+    """Identify common video containers from their leading bytes; None if unrecognised"""
+    if head[4:8] == b"ftyp":
+        brand = bytes(head[8:12])
+        if brand == b"qt  ":
+            return "video/mov"
+        if brand.startswith(b"3g"):
+            return "video/3gpp"
+        return "video/mp4"
+    if head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return "video/avi"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "video/webm"
+    if head[:3] == b"FLV":
+        return "video/x-flv"
+    if head[:4] in (b"\x00\x00\x01\xba", b"\x00\x00\x01\xb3"):
+        return "video/mpeg"
+    if head[:16] == b"\x30\x26\xb2\x75\x8e\x66\xcf\x11\xa6\xd9\x00\xaa\x00\x62\xce\x6c":
+        return "video/wmv"
+    return None
+
+_YT_RE = re.compile(r"youtube\.com/watch\?v=|youtu\.be/")
+
+def _is_youtube_url(video_identifier):
+    """True for YouTube watch/short links, which are passed by URI rather than fetched"""
+    return _YT_RE.search(video_identifier) is not None
+
+def _load_cached_video(cache_path, mapped=True):
+    """Return (mime_type, mapped or read bytes) for a previously downloaded video, or None on a miss"""
+    try:
+        bin_path = cache_path.with_suffix(".bin")
+        # mtime is the download time and drives expiry; atime records use and drives LRU pruning
+        st = bin_path.stat()
+        if time.time() - st.st_mtime > VIDEO_CACHE_TTL:
+            _remove_cached_video(bin_path)
+            return None
+        os.utime(bin_path, (time.time(), st.st_mtime))
+        mime_type = cache_path.with_suffix(".mime").read_text().strip()
+        if not mapped:
+            return mime_type, cache_path.with_suffix(".bin").read_bytes()
+        with open(cache_path.with_suffix(".bin"), "rb") as f:
+            return mime_type, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_video(cache_path, mime_type, video_bytes):
+    """Persist a downloaded video; failures only cost a future re-download"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, data in ((".bin", video_bytes), (".mime", mime_type.encode())):
+            # A unique temp name per write, so concurrent fetches of one URL never share a file
+            with tempfile.NamedTemporaryFile(dir=cache_path.parent, prefix=cache_path.name,
+                                             suffix=suffix + ".tmp", delete=False) as tmp:
+                try:
+                    tmp.write(data)
+                except BaseException:
+                    tmp.close()
+                    os.unlink(tmp.name)
+                    raise
+            os.replace(tmp.name, cache_path.with_suffix(suffix))
+    except OSError as e:
+        logger.warning(f"Could not cache downloaded video at {cache_path}: {e}")
+    _prune_video_cache()
+
+def _remove_cached_video(bin_path):
+    """Delete a cache entry's data and MIME sidecar, ignoring files already gone"""
+    for path in (bin_path, bin_path.with_suffix(".mime")):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+def _prune_video_cache():
+    """Evict the least recently used cache entries until both the entry and byte caps hold"""
+    try:
+        entries = []
+        for bin_path in VIDEO_CACHE_DIR.glob("*.bin"):
+            st = bin_path.stat()
+            entries.append((st.st_atime, st.st_size, bin_path))
+        entries.sort(reverse=True)
+        total = 0
+        for i, (_, size, bin_path) in enumerate(entries):
+            total += size
+            if i >= VIDEO_CACHE_MAX_ENTRIES or total > VIDEO_CACHE_MAX_BYTES:
+                _remove_cached_video(bin_path)
+    except OSError as e:
+        logger.warning(f"Could not prune video cache at {VIDEO_CACHE_DIR}: {e}")
+
+def _b64encode(data) -> str:
+    """Base64-encode a bytes-like object to str, using pybase64 when available"""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
+
+def _inline_video_part(video_bytes, mime_type):
+    """Encode video bytes into a data-URI content part, releasing a mapped file afterwards"""
+    try:
+        base64_video = _b64encode(video_bytes)
+    finally:
+        # Unmap before building the URI so the mapping and both strings are never live at once
+        if isinstance(video_bytes, mmap.mmap):
+            video_bytes.close()
+    # Encode and format for litellm (assuming data URI works for video like image)
+    data_uri = "".join(("data:", mime_type, ";base64,", base64_video))
+    return {
+        "type": "video_url", # Using a distinct type name, hoping litellm handles it
+        "video_url": {"url": data_uri}
+    }
 
 class VideoUnderstandingTool(Tool):
-    def __init__(self):
+    def __init__(self, use_genai_sdk=None):
         super().__init__(
             name="video_understanding",
             description="Analyzes video from local paths, standard URLs, or YouTube URLs to summarize, answer questions, or transcribe.",
@@ -58,6 +206,96 @@ class VideoUnderstandingTool(Tool):
         )
         if not litellm:
              logger.error("litellm library is not available. VideoUnderstandingTool requires it.")
+        # None defers to RAIDEN_VIDEO_USE_GENAI_SDK; litellm handles everything unless this is opted in
+        self._use_genai_sdk = USE_GENAI_SDK if use_genai_sdk is None else use_genai_sdk
+        self._genai = None
+
+    def _load_video(self, video_identifier, mapped=True):
+        """Fetches or maps a URL/local video, returns (video bytes, MIME type). mapped=False returns plain bytes."""
+        # Handle standard URLs
+        if video_identifier.startswith(("http://", "https://")):
+            cache_path = VIDEO_CACHE_DIR / hashlib.sha256(video_identifier.encode()).hexdigest()
+            cached = _load_cached_video(cache_path, mapped)
+            if cached is not None:
+                mime_type, video_bytes = cached
+                logger.info(f"Using cached download for URL. MIME: {mime_type}. Size: {len(video_bytes)} bytes.")
+            else:
+                try:
+                    response = requests.get(video_identifier, timeout=30, stream=True) # Stream for potentially large files
+                    response.raise_for_status()
+                    # Reject oversized videos up front when the server declares the size
+                    content_length = int(response.headers.get('Content-Length') or 0)
+                    if content_length > MAX_INLINE_SIZE_BYTES:
+                        response.close()
+                        raise ToolExecutionError(f"Video file from URL exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB). Use File API if available or provide smaller video.")
+
+                    # Sniff the container from the first chunk so mislabeled servers are classified
+                    # correctly and unsupported content is rejected before the rest is downloaded
+                    chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+                    first_chunk = next(chunks, b"")
+                    mime_type = _sniff_video_mime(first_chunk[:16])
+
+                    if not mime_type:
+                        content_type = response.headers.get('Content-Type')
+                        mime_type = content_type.split(';')[0].strip() if content_type else None
+
+                    if not mime_type or mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
+                         # Try guessing from URL if header is missing/wrong
+                         mime_type = _guess_mime(os.path.splitext(urlparse(video_identifier).path)[1].lower())
+                         if mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
+                              response.close()
+                              raise ToolExecutionError(f"Unsupported or undetermined video MIME type for URL: {mime_type or 'None'}")
+
+                    # Read content, checking size limit for inline data
+                    # Accumulate in a bytearray (amortized O(N)); the encoder takes it as-is, no bytes() copy
+                    video_bytes = bytearray(first_chunk)
+                    for chunk in chunks:
+                        video_bytes.extend(chunk)
+                        if len(video_bytes) > MAX_INLINE_SIZE_BYTES:
+                            raise ToolExecutionError(f"Video file from URL exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB). Use File API if available or provide smaller video.")
+
+                    logger.info(f"Fetched video from URL. MIME: {mime_type}. Size: {len(video_bytes)} bytes.")
+
+                except requests.exceptions.RequestException as e:
+                    raise ToolExecutionError(f"Failed to fetch video from URL '{video_identifier}': {e}")
+                except ToolExecutionError as e:
+                     raise e
+                except Exception as e:
+                     raise ToolExecutionError(f"Error processing video URL '{video_identifier}': {e}")
+
+                _store_cached_video(cache_path, mime_type, video_bytes)
+                if not mapped:
+                    video_bytes = bytes(video_bytes)
+
+        # Handle local file paths
+        else:
+            local_path = Path(video_identifier).resolve()
+            if not local_path.is_file():
+                raise ToolExecutionError(f"Local video file not found: {local_path}")
+            try:
+                file_size = local_path.stat().st_size
+                if file_size > MAX_INLINE_SIZE_BYTES:
+                     raise ToolExecutionError(f"Local video file exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB). Use File API if available or provide smaller video.")
+
+                mime_type = _guess_mime(local_path.suffix.lower())
+                if mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
+                    raise ToolExecutionError(f"Unsupported video MIME type: {mime_type or 'Unknown'}")
+
+                if not mapped:
+                    video_bytes = local_path.read_bytes()
+                else:
+                    # Map the file instead of copying it onto the heap; the encoder reads the pages directly
+                    with open(local_path, "rb") as f:
+                        video_bytes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if hasattr(video_bytes, "madvise"):
+                        video_bytes.madvise(mmap.MADV_SEQUENTIAL)
+                logger.info(f"Read local video file. MIME: {mime_type}. Size: {len(video_bytes)} bytes.")
+            except ToolExecutionError as e:
+                 raise e
+            except Exception as e:
+                raise ToolExecutionError(f"Failed to read local video file '{local_path}': {e}")
+
+        return video_bytes, mime_type
 
     def _process_video_input(self, video_identifier):
         """Processes video path/URL, returns content part for litellm."""
@@ -65,7 +303,7 @@ class VideoUnderstandingTool(Tool):
         content_part = {}
 
         # Handle YouTube URLs directly (assuming litellm supports this format)
-        if "youtube.com/watch?v=" in video_identifier or "youtu.be/" in video_identifier:
+        if _is_youtube_url(video_identifier):
             logger.info("Identified YouTube URL.")
             # Format based on Google SDK example, hoping litellm understands similar structure
             # This part is experimental with litellm - might need adjustment
@@ -80,72 +318,48 @@ class VideoUnderstandingTool(Tool):
             # content_part = {"type": "text", "text": f"Analyze YouTube video: {video_identifier}"}
             return content_part, "youtube" # Indicate type
 
-        # Handle standard URLs
-        elif video_identifier.startswith("http://") or video_identifier.startswith("https://"):
-            try:
-                response = requests.get(video_identifier, timeout=30, stream=True) # Stream for potentially large files
-                response.raise_for_status()
-                content_type = response.headers.get('Content-Type')
-                mime_type = content_type.split(';')[0].strip() if content_type else None
-
-                if not mime_type or mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
-                     # Try guessing from URL if header is missing/wrong
-                     mime_type, _ = mimetypes.guess_type(video_identifier)
-                     if mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
-                          raise ToolExecutionError(f"Unsupported or undetermined video MIME type for URL: {mime_type or 'None'}")
-
-                # Read content, checking size limit for inline data
-                video_bytes = b""
-                for chunk in response.iter_content(chunk_size=8192):
-                    video_bytes += chunk
-                    if len(video_bytes) > MAX_INLINE_SIZE_BYTES:
-                        raise ToolExecutionError(f"Video file from URL exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB). Use File API if available or provide smaller video.")
-
-                logger.info(f"Fetched video from URL. MIME: {mime_type}. Size: {len(video_bytes)} bytes.")
+        video_bytes, mime_type = self._load_video(video_identifier)
 
-            except requests.exceptions.RequestException as e:
-                raise ToolExecutionError(f"Failed to fetch video from URL '{video_identifier}': {e}")
-            except ToolExecutionError as e:
-                 raise e
-            except Exception as e:
-                 raise ToolExecutionError(f"Error processing video URL '{video_identifier}': {e}")
+        try:
+            # Upload raw bytes when possible: skips the base64 encode and its 33% size inflation
+            if len(video_bytes) >= UPLOAD_THRESHOLD_BYTES and hasattr(litellm, "create_file"):
+                filename = Path(video_identifier.split('?')[0]).name or "video"
+                try:
+                    uploaded = litellm.create_file(
+                        file=(filename, bytes(video_bytes), mime_type),
+                        purpose="user_data",
+                        custom_llm_provider="gemini"
+                    )
+                    content_part = {
+                        "type": "file",
+                        "file": {"file_id": uploaded.id, "format": mime_type}
+                    }
+                    logger.info(f"Uploaded video via litellm file API: {uploaded.id}")
+                    return content_part, "uploaded" # Indicate type
+                except Exception as e:
+                    logger.warning(f"Video upload failed, falling back to inline data: {e}")
 
-        # Handle local file paths
-        else:
-            local_path = Path(video_identifier).resolve()
-            if not local_path.is_file():
-                raise ToolExecutionError(f"Local video file not found: {local_path}")
             try:
-                file_size = local_path.stat().st_size
-                if file_size > MAX_INLINE_SIZE_BYTES:
-                     raise ToolExecutionError(f"Local video file exceeds inline size limit ({MAX_INLINE_SIZE_BYTES / (1024*1024):.1f} MB). Use File API if available or provide smaller video.")
-
-                video_bytes = local_path.read_bytes()
-                mime_type, _ = mimetypes.guess_type(local_path)
-                if mime_type not in SUPPORTED_VIDEO_MIME_TYPES:
-                    # Add basic check based on extension if mimetypes fails
-                    ext = local_path.suffix.lower()
-                    simple_mime_map = {'.mp4': 'video/mp4', '.mov': 'video/mov', '.avi': 'video/avi', '.webm': 'video/webm', '.mpg': 'video/mpg', '.wmv': 'video/wmv'}
-                    if ext in simple_mime_map:
-                         mime_type = simple_mime_map[ext]
-                         logger.warning(f"Guessed MIME type '{mime_type}' based on extension for {local_path}")
-                    else:
-                         raise ToolExecutionError(f"Unsupported video MIME type: {mime_type or 'Unknown'}")
-
-                logger.info(f"Read local video file. MIME: {mime_type}. Size: {len(video_bytes)} bytes.")
-            except ToolExecutionError as e:
-                 raise e
+                return _inline_video_part(video_bytes, mime_type), "inline" # Indicate type
             except Exception as e:
-                raise ToolExecutionError(f"Failed to read local video file '{local_path}': {e}")
+                raise ToolExecutionError(f"Failed to encode video '{video_identifier}': {e}")
+        finally:
+            # No-op when _inline_video_part already unmapped it
+            if isinstance(video_bytes, mmap.mmap):
+                video_bytes.close()
 
-        # Encode and format for litellm (assuming data URI works for video like image)
-        base64_video = base64.b64encode(video_bytes).decode('utf-8')
-        data_uri = f"data:{mime_type};base64,{base64_video}"
-        content_part = {
-            "type": "video_url", # Using a distinct type name, hoping litellm handles it
-            "video_url": {"url": data_uri}
-        }
-        return content_part, "inline" # Indicate type
+    def _generate_with_genai(self, model_name, video_part, prompt):
+        """Calls Gemini through the Google SDK with the video as raw inline bytes."""
+        if self._genai is None:
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                raise ToolExecutionError("google-generativeai is not installed but the video tool is configured to use it.")
+            genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+            self._genai = genai
+        model = self._genai.GenerativeModel(model_name.split("/", 1)[-1])
+        response = model.generate_content([video_part, prompt])
+        return response.text
 
     def execute(self, **kwargs):
         if not litellm:
@@ -162,10 +376,16 @@ class VideoUnderstandingTool(Tool):
              raise ToolExecutionError("'prompt' is required for 'ask_question' operation.")
 
         # --- Process Video Input ---
-        try:
-            video_content_part, input_type = self._process_video_input(video_path)
-        except ToolExecutionError as e:
-            raise e # Propagate errors from processing
+        if self._use_genai_sdk and not _is_youtube_url(video_path):
+            # Hand raw bytes to the Google SDK; no base64 encode, no data URI. The SDK needs real bytes,
+            # so read them directly rather than mapping the file and copying the mapping
+            video_bytes, mime_type = self._load_video(video_path, mapped=False)
+            video_content_part, input_type = {"mime_type": mime_type, "data": video_bytes}, "raw"
+        else:
+            try:
+                video_content_part, input_type = self._process_video_input(video_path)
+            except ToolExecutionError as e:
+                raise e # Propagate errors from processing
 
         # --- Construct Prompt and Content List ---
         final_prompt = prompt
@@ -190,12 +410,15 @@ class VideoUnderstandingTool(Tool):
         logger.info(f"Sending request to {model_name} for video '{video_path}' with prompt: '{final_prompt[:100]}...'")
 
         try:
-            messages = [{"role": "user", "content": content_list}]
-            response = litellm.completion(
-                model=model_name,
-                messages=messages
-            )
-            response_text = response.choices[0].message.content
+            if input_type == "raw":
+                response_text = self._generate_with_genai(model_name, video_content_part, final_prompt.strip())
+            else:
+                messages = [{"role": "user", "content": content_list}]
+                response = litellm.completion(
+                    model=model_name,
+                    messages=messages
+                )
+                response_text = response.choices[0].message.content
             if not response_text:
                  logger.warning(f"Received empty response from {model_name} for video analysis.")
                  return "Model returned an empty response for the video analysis."
@@ -2,9 +2,17 @@ import logging
 import requests
 from dotenv import load_dotenv
 import time
+import random
 import json
 from datetime import datetime
-from .base_tool import Tool, ToolExecutionError
+from requests.adapters import HTTPAdapter
+from .base_tool import Tool, ToolExecutionError, get_vector_db
+
+# Try importing orjson for faster JSON decoding, fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("gemini_agent")
 
@@ -13,6 +21,17 @@ load_dotenv()
 import os
 openweathermap_api_key = os.environ.get("OPENWEATHERMAP_API_KEY")
 
+# Keep-alive session for OpenWeatherMap. Adapter retries stay off (the default) because
+# execute() owns the retry policy; stacking both would multiply attempts and hide Timeout/HTTPError.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# Upper bound (seconds) on the backoff between attempts, before jitter
+MAX_RETRY_DELAY = 8
+# Transient statuses worth another attempt; anything else is reported straight away
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 class WeatherTool(Tool):
     def __init__(self): 
         super().__init__(
@@ -46,9 +65,9 @@ class WeatherTool(Tool):
         
         for attempt in range(retries):
             try:
-                r = requests.get(url, params=params, timeout=10)
+                r = _SESSION.get(url, params=params, timeout=10)
                 r.raise_for_status()
-                data = r.json()
+                data = orjson.loads(r.content) if orjson is not None else r.json()
                 
                 if data.get("cod") != 200:
                     raise ToolExecutionError(f"Weather API Error: {data.get('message', 'Unknown')}")
@@ -63,29 +82,30 @@ class WeatherTool(Tool):
                 res = f"Weather in {data.get('name', location)}: {description}, Temp: {temp}{symbol} (feels like {feels_like}{symbol}), Humidity: {humidity}%"
 
                 # Store in vector DB if available
-                try:
-                    from __main__ import vector_db
-                    if vector_db.is_ready():
-                        vector_db.add(
-                            f"Weather: {location}({unit}): {res}", 
-                            {
-                                "type": "weather", 
-                                "location": location, 
-                                "time": datetime.now().isoformat()
-                            }
-                        )
-                except ImportError:
-                    pass
+                vector_db = get_vector_db()
+                if vector_db is not None and vector_db.is_ready():
+                    vector_db.add(
+                        f"Weather: {location}({unit}): {res}", 
+                        {
+                            "type": "weather", 
+                            "location": location, 
+                            "time": datetime.now().isoformat()
+                        }
+                    )
 
                 return res
 
             except requests.exceptions.Timeout:
                 logger.warning(f"Weather timeout {location} (try {attempt+1}). Retrying...")
+            except requests.exceptions.ConnectionError as e:
+                logger.warning(f"Weather connection error {location} (try {attempt+1}): {e}. Retrying...")
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 404:
                     raise ToolExecutionError(f"City '{location}' not found.")
                 elif e.response.status_code == 401:
                     raise ToolExecutionError("Invalid Weather API key.")
+                elif e.response.status_code in RETRYABLE_STATUS_CODES and attempt < retries - 1:
+                    logger.warning(f"Weather HTTP {e.response.status_code} {location} (try {attempt+1}). Retrying...")
                 else:
                     logger.error(f"Weather HTTP error: {e}")
                     raise ToolExecutionError(f"HTTP error {e.response.status_code}")
@@ -96,7 +116,9 @@ class WeatherTool(Tool):
                 logger.error(f"Unexpected weather error: {e}")
                 raise ToolExecutionError(f"Unexpected error: {e}")
 
-            time.sleep(delay)
-            delay *= 2
+            if attempt < retries - 1:
+                # Jitter keeps concurrent callers from retrying in lockstep
+                time.sleep(min(MAX_RETRY_DELAY, delay) + random.uniform(0, 1))
+                delay *= 2
 
         raise ToolExecutionError(f"Weather fetch failed after {retries} attempts.")
\ No newline at end of file
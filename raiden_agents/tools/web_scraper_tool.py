@@ -5,7 +5,13 @@ from dotenv import load_dotenv
 import traceback
 from datetime import datetime
 from firecrawl import FirecrawlApp
-from .base_tool import Tool, ToolExecutionError
+from .base_tool import Tool, ToolExecutionError, get_vector_db
+
+# Try importing orjson for faster JSON encoding and decoding, fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 load_dotenv()
@@ -31,17 +37,19 @@ class WebScraperTool(Tool):
             },
             required=["url"]
         )
+        # One client per tool so its HTTP session and connection pool are reused across scrapes
+        self._app = FirecrawlApp(api_key=firecrawl_api_key) if firecrawl_api_key else None
 
     def execute(self, **kwargs):
         self.validate_args(kwargs)
         url = kwargs.get("url")
         logger.info(f"Scraping URL: {url}")
         
-        if not firecrawl_api_key:
+        app = self._app
+        if app is None:
             raise ToolExecutionError("Firecrawl API key missing.")
             
         try:
-            app = FirecrawlApp(api_key=firecrawl_api_key)
             scraped_data = app.scrape_url(url=url, params={'formats': ['markdown']})
             markdown_content = None
             
@@ -54,24 +62,27 @@ class WebScraperTool(Tool):
                 logger.info(f"Scrape success: {url}")
                 
                 # Store in vector DB if available
-                try:
-                    from __main__ import vector_db
-                    if vector_db.is_ready():
-                        chunks = self._chunk_content(markdown_content)
-                        logger.info(f"Storing {len(chunks)} chunks from {url} in VDB.")
-                        for i, chunk in enumerate(chunks):
-                            vector_db.add(
-                                chunk,
-                                {
-                                    "type": "web_content",
-                                    "url": url,
-                                    "chunk": i+1,
-                                    "total_chunks": len(chunks),
-                                    "time": datetime.now().isoformat()
-                                }
-                            )
-                except ImportError:
-                    pass
+                vector_db = get_vector_db()
+                if vector_db is not None and vector_db.is_ready():
+                    chunks = self._chunk_content(markdown_content)
+                    logger.info(f"Storing {len(chunks)} chunks from {url} in VDB.")
+                    stored_at = datetime.now().isoformat()
+                    metadatas = [
+                        {
+                            "type": "web_content",
+                            "url": url,
+                            "chunk": i+1,
+                            "total_chunks": len(chunks),
+                            "time": stored_at
+                        }
+                        for i in range(len(chunks))
+                    ]
+                    if hasattr(vector_db, "add_many"):
+                        # One batched upsert instead of a round trip per chunk
+                        vector_db.add_many(chunks, metadatas)
+                    else:
+                        for chunk, metadata in zip(chunks, metadatas):
+                            vector_db.add(chunk, metadata)
                     
                 return markdown_content
             else:
@@ -83,8 +94,13 @@ class WebScraperTool(Tool):
             logger.error(f"Scrape HTTP error: {e}")
             msg = f"Status {e.response.status_code}"
             try:
-                details = e.response.json()
-                msg += f". Details: {details.get('error', details.get('message', json.dumps(details)))}"
+                if orjson is not None:
+                    details = orjson.loads(e.response.content)
+                    encoded = orjson.dumps(details).decode()
+                else:
+                    details = e.response.json()
+                    encoded = json.dumps(details)
+                msg += f". Details: {details.get('error', details.get('message', encoded))}"
             except json.JSONDecodeError:
                 msg += f". Response: {e.response.text}"
             raise ToolExecutionError(f"Firecrawl API request failed. {msg}")
@@ -101,15 +117,5 @@ class WebScraperTool(Tool):
         if len(content) <= max_chars:
             return [content]
             
-        chunks = []
-        start = 0
-        
-        while start < len(content):
-            end = min(start + max_chars, len(content))
-            chunks.append(content[start:end])
-            start += max_chars - overlap
-            if start >= len(content):
-                break
-            start = max(0, start)
-            
-        return [c for c in chunks if c]
+        step = max_chars - overlap
+        return [content[start:start + max_chars] for start in range(0, len(content), step)]